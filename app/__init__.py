@@ -1,18 +1,53 @@
 from datetime import timedelta
 
-from flask import Flask
-from config import Config
+from flask import Flask, request
+from flask.sessions import SecureCookieSessionInterface
+from config import Config, settings
 
 
-def create_app():
-    """Flask application factory."""
+class _SessionInterface(SecureCookieSessionInterface):
+    """
+    Cookie sessions that background polling does not keep alive: the
+    dashboard polls /api/state, and refreshing the cookie there would
+    stop the inactivity logout from ever firing.
+    """
+
+    POLLING_ENDPOINTS = frozenset({'main.state'})
+
+    def should_set_cookie(self, app, session):
+        if (request.endpoint in self.POLLING_ENDPOINTS
+                and not session.modified):
+            return False
+        return super().should_set_cookie(app, session)
+
+
+def create_app(config=None):
+    """
+    Flask application factory.
+    'config' is a Config object; defaults to Config.instance().
+    """
+    if config is None:
+        config = Config.instance()
     app = Flask(__name__)
-    app.config.from_object(Config)
+    app.config.from_mapping(settings(config))
+    # Both secrets are required outside debug: fail here, not on the
+    # first admin login. The password itself is read when it is checked.
+    app.secret_key = Config.secret_key()
+    Config.admin_password()
 
     # Session timeout: auto-logout after 30 minutes of inactivity
     app.permanent_session_lifetime = timedelta(minutes=30)
+    app.session_interface = _SessionInterface()
 
     from app.routes import main_bp
     app.register_blueprint(main_bp)
 
+    # One DataManager per process; routes reach it through _dm()
+    from app.data_manager import DataManager
+    app.extensions['dm'] = DataManager(config.DATA_FILE)
+
+    # Notification emails are sent off the request thread
+    from app.email_service import EmailWorker
+    app.extensions['email_worker'] = EmailWorker()
+
     return app
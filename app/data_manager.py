@@ -1,150 +1,555 @@
+import atexit
+import collections
+import copy
+import functools
+import hashlib
+import itertools
 import json
 import os
 import threading
-from datetime import datetime
+from contextlib import contextmanager
+import time
+
+try:
+    import orjson
+except ImportError:  # fall back to the (slower) standard library
+    orjson = None
+
+# Large enough that a whole inventory/history payload is one write() call
+_WRITE_BUFFER = 1 << 16
+
+# Buffered history entries are flushed once this many are pending, or
+# after this many seconds, whichever comes first
+_HISTORY_BATCH = 64
+_HISTORY_FLUSH_INTERVAL = 0.25
+
+
+# Default sample inventory: (cupboard id, cupboard name, item names)
+_DEFAULT_SPEC = (
+    (1, "Cupboard 1 - Measurement Equipment", (
+        "Digital Oscilloscope 100MHz", "Digital Multimeter",
+        "Function Generator", "Logic Analyzer",
+    )),
+    (2, "Cupboard 2 - Power Supplies", (
+        "DC Power Supply 30V/5A", "Variable Power Supply", "Battery Charger",
+    )),
+    (3, "Cupboard 3 - Development Boards", (
+        "Arduino Mega", "Raspberry Pi 4", "STM32 Nucleo Board",
+        "ESP32 Dev Kit",
+    )),
+    (4, "Cupboard 4 - Networking Equipment", (
+        "Ethernet Switch 8-Port", "Wi-Fi Router", "Network Cable Tester",
+    )),
+    (5, "Cupboard 5 - Testing Tools", (
+        "JTAG Debugger", "USB Protocol Analyzer", "CAN Bus Analyzer",
+        "Spectrum Analyzer",
+    )),
+    (6, "Cupboard 6 - Cables & Connectors", (
+        "USB-A to USB-B Cable Set", "HDMI Cable Set", "Jumper Wire Kit",
+        "BNC Cable Set",
+    )),
+    (7, "Cupboard 7 - Safety Equipment", (
+        "ESD Wrist Strap", "Safety Goggles", "Anti-Static Mat",
+    )),
+    (8, "Cupboard 8 - Hand Tools", (
+        "Soldering Station", "Precision Screwdriver Set", "Wire Stripper",
+        "Heat Gun",
+    )),
+    (9, "Cupboard 9 - Miscellaneous", (
+        "Label Printer", "USB Hub 7-Port", "SD Card Reader",
+    )),
+)
+
+
+def _now():
+    """Current local time in the format stored in the data files."""
+    return time.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _json_loads(raw):
+    """Parse JSON from bytes."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _json_dumps(data):
+    """Serialize to indented UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _json_compact(data):
+    """Serialize to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+def _json_line(data):
+    """Serialize to a single newline-terminated JSON line (JSONL)."""
+    return _json_compact(data) + b'\n'
+
+
+class _RWLock:
+    """
+    Readers-writer lock: many readers at once, writers get exclusive access.
+    Waiting writers block new readers so mutations are not starved.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
 
 
 class DataManager:
     """
     Manages inventory data stored in a JSON file.
-    Thread-safe operations for concurrent access.
-    No database required - all data persisted in JSON.
+    Thread-safe operations for concurrent access: reads share the lock,
+    mutations take it exclusively.
+    No database required - all data persisted in JSON; the audit history
+    is an append-only JSON Lines file, oldest entry first. History entries
+    logged while a write is in progress are buffered and appended in
+    batches by a background thread.
     """
 
-    _lock = threading.Lock()
+    _lock = _RWLock()
+    # Files already checked/created by this process (guarded by _lock)
+    _initialized_paths = set()
 
     def __init__(self, data_file):
-        self.data_file = data_file
+        self.data_file = os.fspath(data_file)
         self.history_file = os.path.join(
+            os.path.dirname(data_file), 'history.jsonl'
+        )
+        # Pre-JSONL history format: {"history": [...]}, newest first
+        self.legacy_history_file = os.path.join(
             os.path.dirname(data_file), 'history.json'
         )
+        # Parsed file contents kept in memory, together with the
+        # (mtime, size, inode) signature of the file they were read from
+        self._data = None
+        self._data_sig = None
+        # Lookup indexes over self._data, rebuilt whenever it is reloaded
+        self._cupboard_by_id = {}
+        self._item_by_id = {}
+        # Bumped whenever self._data changes; the snapshot is a read-only
+        # (version, cupboards, json, etag) tuple rebuilt lazily on change
+        self._snapshot_version = 0
+        self._snapshot = None
+        # Serializes reloads done under the shared read lock, so the
+        # indexes, self._data and the version always match one file
+        self._reload_lock = threading.Lock()
+        # History entries not yet on disk (oldest first). The history lock
+        # keeps readers from missing entries while a batch is written.
+        self._history_buf = collections.deque()
+        self._history_cond = threading.Condition()
+        self._history_lock = _RWLock()
+        self._history_flushing = False  # a batch is being written
+        self._history_flusher = None
         self._ensure_data_file()
         self._ensure_history_file()
 
     def _ensure_history_file(self):
-        """Create history file if it doesn't exist."""
-        if not os.path.exists(self.history_file):
-            os.makedirs(os.path.dirname(self.history_file), exist_ok=True)
-            with open(self.history_file, 'w', encoding='utf-8') as f:
-                json.dump({"history": []}, f, indent=2)
-
-    def _load_history(self):
-        """Load history from JSON file."""
-        with open(self.history_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-
-    def _save_history(self, data):
-        """Save history to JSON file."""
-        with open(self.history_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        """
+        Create history file if it doesn't exist, migrating entries from
+        the legacy history.json if one is present. The legacy file is
+        left untouched.
+        """
+        if self.history_file in self._initialized_paths:
+            return
+        with self._lock.write():
+            if not os.path.exists(self.history_file):
+                os.makedirs(os.path.dirname(self.history_file), exist_ok=True)
+                records = []
+                if os.path.exists(self.legacy_history_file):
+                    with open(self.legacy_history_file, 'rb') as f:
+                        records = _json_loads(f.read()).get('history', [])
+                    for r in records:
+                        r['nt_id'] = (r.get('nt_id') or '').upper()
+                self._atomic_write(
+                    self.history_file,
+                    b''.join(_json_line(r) for r in reversed(records)),
+                )
+            self._initialized_paths.add(self.history_file)
+
+    def _iter_history(self, chunk_size=1 << 16):
+        """
+        Yield history entries newest first, reading the file backwards
+        in chunks so only the requested tail is ever parsed.
+        """
+        with open(self.history_file, 'rb') as f:
+            pos = f.seek(0, os.SEEK_END)
+            head = b''
+            while pos > 0:
+                step = min(chunk_size, pos)
+                pos -= step
+                f.seek(pos)
+                lines = (f.read(step) + head).split(b'\n')
+                head = lines.pop(0)  # may continue in the previous chunk
+                yield from self._parse_history_lines(reversed(lines))
+            yield from self._parse_history_lines([head])
+
+    @staticmethod
+    def _parse_history_lines(lines):
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                yield _json_loads(line)
+            except ValueError:
+                # Torn line from an append still in flight - skip it
+                continue
 
     # ------------------------------------------------------------------
     # HISTORY / AUDIT LOG operations
     # ------------------------------------------------------------------
 
-    def log_action(self, action, item_name, cupboard_name, nt_id):
-        """Record a borrow/return action in the history log."""
-        with self._lock:
-            data = self._load_history()
-            entry = {
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'action': action,
-                'item_name': item_name,
-                'cupboard_name': cupboard_name,
-                'nt_id': nt_id,
-            }
-            data.setdefault('history', []).insert(0, entry)  # newest first
-            self._save_history(data)
+    def log_action(self, action, item_name, cupboard_name, nt_id,
+                   timestamp=None):
+        """
+        Record a borrow/return action (at 'timestamp', default: now).
+        If no other history write is in progress the entry is on disk
+        when this returns. Otherwise it is appended by the background
+        thread within _HISTORY_FLUSH_INTERVAL seconds (sooner once
+        _HISTORY_BATCH entries are pending). Until then only this
+        process's get_history sees it, and a hard kill (SIGKILL) loses
+        it; a normal exit flushes it through atexit.
+        """
+        entry = {
+            'timestamp': timestamp or _now(),
+            'action': action,
+            'item_name': item_name,
+            'cupboard_name': cupboard_name,
+            'nt_id': nt_id.upper(),  # stored upper-case for filtering
+        }
+        with self._history_cond:
+            self._history_buf.append(entry)
+            idle = (len(self._history_buf) == 1
+                    and not self._history_flushing)
+            if not idle:
+                self._wake_history_flusher()
+                return
+        try:
+            self.flush()
+        except Exception as e:
+            # Left buffered; the background thread retries
+            print(f"[HISTORY ERROR] {e}")
+            with self._history_cond:
+                self._wake_history_flusher()
+                self._history_cond.notify()
+
+    def _wake_history_flusher(self):
+        """Hand buffered entries to the flush thread; holds _history_cond."""
+        if self._history_flusher is None:
+            self._start_history_flusher()
+        if len(self._history_buf) in (1, _HISTORY_BATCH):
+            self._history_cond.notify()
+
+    def flush(self):
+        """Write any buffered history entries to disk in one append."""
+        with self._history_lock.write():
+            with self._history_cond:
+                if not self._history_buf:
+                    return
+                batch = list(self._history_buf)
+                self._history_buf.clear()
+                self._history_flushing = True
+            try:
+                self._append(
+                    self.history_file,
+                    b''.join(_json_line(entry) for entry in batch),
+                )
+            except Exception:
+                with self._history_cond:
+                    self._history_buf.extendleft(reversed(batch))
+                raise
+            finally:
+                with self._history_cond:
+                    self._history_flushing = False
+
+    def _start_history_flusher(self):
+        """Start the flush thread; caller holds _history_cond."""
+        self._history_flusher = threading.Thread(
+            target=self._run_history_flusher,
+            name='history-flusher',
+            daemon=True,
+        )
+        self._history_flusher.start()
+        atexit.register(self.flush)
+
+    def _run_history_flusher(self):
+        while True:
+            with self._history_cond:
+                while not self._history_buf:
+                    self._history_cond.wait()
+                deadline = time.monotonic() + _HISTORY_FLUSH_INTERVAL
+                while len(self._history_buf) < _HISTORY_BATCH:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._history_cond.wait(remaining)
+            try:
+                self.flush()
+            except Exception as e:
+                # Entries stay buffered; retried on the next pass
+                print(f"[HISTORY ERROR] {e}")
+                time.sleep(_HISTORY_FLUSH_INTERVAL)
 
     def get_history(self, nt_id_filter=None, action_filter=None, limit=200):
         """
         Get audit history with optional filters.
         Returns newest entries first.
         """
-        with self._lock:
-            data = self._load_history()
-            records = data.get('history', [])
-
-            if nt_id_filter:
-                records = [
-                    r for r in records
-                    if r.get('nt_id', '').upper() == nt_id_filter.upper()
-                ]
-            if action_filter:
-                records = [
-                    r for r in records
-                    if r.get('action') == action_filter
-                ]
-
-            return records[:limit]
+        needle = nt_id_filter.upper() if nt_id_filter else None
+        out = []
+        if limit <= 0:
+            return out
+        with self._history_lock.read():
+            with self._history_cond:
+                pending = list(self._history_buf)
+            records = itertools.chain(reversed(pending), self._iter_history())
+            for r in records:
+                if needle and r.get('nt_id') != needle:
+                    continue
+                if action_filter and r.get('action') != action_filter:
+                    continue
+                out.append(r)
+                if len(out) >= limit:
+                    break
+        return out
 
     def _ensure_data_file(self):
         """Create data file with default sample data if it doesn't exist."""
-        if not os.path.exists(self.data_file):
-            os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
-            self._save_data(self._get_default_data())
+        if self.data_file in self._initialized_paths:
+            return
+        with self._lock.write():
+            if not os.path.exists(self.data_file):
+                os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
+                self._atomic_write(
+                    self.data_file, _json_dumps(self._get_default_data())
+                )
+            self._initialized_paths.add(self.data_file)
 
     def _load_data(self):
-        """Load data from JSON file."""
-        with open(self.data_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        """Load data, re-reading the JSON file only if it changed."""
+        # May run under the shared read lock: a reload rebinds the cache
+        # to a fresh dict and never edits the one other readers hold.
+        sig = self._file_signature(self.data_file)
+        if self._data is None or sig != self._data_sig:
+            with self._reload_lock:
+                # Another reader may have reloaded while we waited
+                sig = self._file_signature(self.data_file)
+                if self._data is None or sig != self._data_sig:
+                    with open(self.data_file, 'rb') as f:
+                        data = _json_loads(f.read())
+                    self._build_indexes(data)
+                    self._data = data
+                    self._data_sig = sig
+                    self._snapshot_version += 1
+        return self._data
 
     def _save_data(self, data):
-        """Save data to JSON file."""
-        with open(self.data_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        """Save data to JSON file and keep it as the cached copy."""
+        try:
+            sig = self._atomic_write(self.data_file, _json_dumps(data))
+        except Exception:
+            self._data = None
+            raise
+        if data is not self._data:
+            self._build_indexes(data)
+        self._data = data
+        self._data_sig = sig
+        self._snapshot_version += 1
+
+    def _build_indexes(self, data):
+        """Index cupboards by id and items by (cupboard_id, item_id)."""
+        cupboards = data.get('cupboards', [])
+        self._cupboard_by_id = {c['id']: c for c in cupboards}
+        self._item_by_id = {
+            (c['id'], i['id']): i
+            for c in cupboards for i in c.get('items', [])
+        }
+
+    def _next_item_seq(self, cupboard):
+        """
+        Return the next free item number of a cupboard. It is stored in
+        the file as 'next_item_seq', so every worker agrees on it and a
+        removed id is never issued again; files written before the
+        counter existed start from the highest existing number + 1.
+        """
+        seq = cupboard.get('next_item_seq')
+        if seq is None:
+            seq = max(
+                (self._item_seq(i['id']) for i in cupboard.get('items', [])),
+                default=0,
+            ) + 1
+            cupboard['next_item_seq'] = seq
+        return seq
+
+    def _next_cupboard_id(self, data):
+        """Like _next_item_seq, for cupboard ids ('next_cupboard_id')."""
+        seq = data.get('next_cupboard_id')
+        if seq is None:
+            seq = max(self._cupboard_by_id, default=0) + 1
+            data['next_cupboard_id'] = seq
+        return seq
+
+    @staticmethod
+    def _item_seq(item_id):
+        """Return the number of a 'C<cupboard>_<nnn>' id, 0 if not one."""
+        _, _, num = item_id.rpartition('_')
+        return int(num) if num.isdigit() else 0
+
+    # ------------------------------------------------------------------
+    # File helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _file_signature(path):
+        """
+        Return (mtime, size, inode) so changes by other workers are
+        noticed - the inode also catches a file swapped in by os.replace
+        with the same size and timestamp.
+        """
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    @staticmethod
+    def _atomic_write(path, payload):
+        """
+        Write bytes to a temp file in one buffered write, sync it to disk,
+        then swap it in atomically - readers never see a partial file.
+        Returns the (mtime, size, inode) signature of the file written,
+        taken before the swap so a later replace by another worker can't
+        be mistaken for ours.
+        """
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, 'wb', buffering=_WRITE_BUFFER) as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+                st = os.fstat(f.fileno())
+            os.replace(tmp, path)
+            return st.st_mtime_ns, st.st_size, st.st_ino
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    @staticmethod
+    def _append(path, payload):
+        """Append bytes with a single write and sync them to disk."""
+        with open(path, 'ab', buffering=_WRITE_BUFFER) as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
 
     # ------------------------------------------------------------------
     # READ operations
     # ------------------------------------------------------------------
 
     def get_all_cupboards(self):
-        """Get all cupboards with their items."""
-        with self._lock:
-            data = self._load_data()
-            return data.get('cupboards', [])
+        """
+        Get all cupboards with their items.
+        Returns a shared snapshot that later mutations never touch;
+        callers must treat it as read-only.
+        """
+        with self._lock.read():
+            return self._get_snapshot()[1]
+
+    def get_all_cupboards_json(self):
+        """
+        Get all cupboards as (etag, JSON bytes).
+        The ETag is a content hash, so it matches across worker processes.
+        """
+        with self._lock.read():
+            _, _, payload, etag = self._get_snapshot()
+            return etag, payload
+
+    def _get_snapshot(self):
+        """Return the snapshot tuple, rebuilding it if the data changed."""
+        self._load_data()
+        with self._reload_lock:
+            data, version = self._data, self._snapshot_version
+        snapshot = self._snapshot
+        if snapshot is None or snapshot[0] != version:
+            cupboards = copy.deepcopy(data.get('cupboards', []))
+            payload = _json_compact(cupboards)
+            etag = hashlib.blake2b(payload, digest_size=8).hexdigest()
+            snapshot = (version, cupboards, payload, etag)
+            self._snapshot = snapshot
+        return snapshot
 
     # ------------------------------------------------------------------
     # LOCK / UNLOCK operations
     # ------------------------------------------------------------------
 
-    def toggle_lock(self, cupboard_id, item_id, nt_id, is_admin=False):
+    def toggle_lock(self, cupboard_id, item_id, nt_id, is_admin=False,
+                    timestamp=None):
         """
-        Toggle the lock status of an item.
+        Toggle the lock status of an item; 'timestamp' (default: now)
+        is recorded as borrowed_at.
         Returns: (action, item_name, cupboard_name) or None if not found,
                  or ('not_authorized', item_name, cupboard_name) if user
                  tries to return an item they didn't borrow.
         """
-        with self._lock:
+        with self._lock.write():
             data = self._load_data()
-            for cupboard in data.get('cupboards', []):
-                if cupboard['id'] == cupboard_id:
-                    for item in cupboard.get('items', []):
-                        if item['id'] == item_id:
-                            if item['is_locked']:
-                                # UNLOCK (borrow) the item
-                                item['is_locked'] = False
-                                item['borrowed_by'] = nt_id
-                                item['borrowed_at'] = datetime.now().strftime(
-                                    '%Y-%m-%d %H:%M:%S'
-                                )
-                                action = 'unlocked'
-                            else:
-                                # Only the borrower or admin can return
-                                if item['borrowed_by'] != nt_id and not is_admin:
-                                    return (
-                                        'not_authorized',
-                                        item['name'],
-                                        cupboard['name'],
-                                    )
-                                # LOCK (return) the item
-                                item['is_locked'] = True
-                                item['borrowed_by'] = None
-                                item['borrowed_at'] = None
-                                action = 'locked'
-                            self._save_data(data)
-                            return action, item['name'], cupboard['name']
-            return None
+            cupboard = self._cupboard_by_id.get(cupboard_id)
+            item = self._item_by_id.get((cupboard_id, item_id))
+            if cupboard is None or item is None:
+                return None
+            if item['is_locked']:
+                # UNLOCK (borrow) the item
+                item['is_locked'] = False
+                item['borrowed_by'] = nt_id
+                item['borrowed_at'] = timestamp or _now()
+                action = 'unlocked'
+            else:
+                # Only the borrower or admin can return
+                if item['borrowed_by'] != nt_id and not is_admin:
+                    return 'not_authorized', item['name'], cupboard['name']
+                # LOCK (return) the item
+                item['is_locked'] = True
+                item['borrowed_by'] = None
+                item['borrowed_at'] = None
+                action = 'locked'
+            self._save_data(data)
+            return action, item['name'], cupboard['name']
 
     # ------------------------------------------------------------------
     # ADMIN - Item operations
@@ -152,38 +557,39 @@ class DataManager:
 
     def add_item(self, cupboard_id, item_name):
         """Add a new item to a cupboard."""
-        with self._lock:
+        with self._lock.write():
             data = self._load_data()
-            for cupboard in data.get('cupboards', []):
-                if cupboard['id'] == cupboard_id:
-                    existing_ids = [i['id'] for i in cupboard.get('items', [])]
-                    new_num = 1
-                    while f"C{cupboard_id}_{new_num:03d}" in existing_ids:
-                        new_num += 1
-                    new_item = {
-                        'id': f"C{cupboard_id}_{new_num:03d}",
-                        'name': item_name,
-                        'is_locked': True,
-                        'borrowed_by': None,
-                        'borrowed_at': None,
-                    }
-                    cupboard.setdefault('items', []).append(new_item)
-                    self._save_data(data)
-                    return True
-            return False
+            cupboard = self._cupboard_by_id.get(cupboard_id)
+            if cupboard is None:
+                return False
+            new_num = self._next_item_seq(cupboard)
+            cupboard['next_item_seq'] = new_num + 1
+            new_item = {
+                'id': f"C{cupboard_id}_{new_num:03d}",
+                'name': item_name,
+                'is_locked': True,
+                'borrowed_by': None,
+                'borrowed_at': None,
+            }
+            cupboard.setdefault('items', []).append(new_item)
+            self._item_by_id[(cupboard_id, new_item['id'])] = new_item
+            self._save_data(data)
+            return True
 
     def remove_item(self, cupboard_id, item_id):
         """Remove an item from a cupboard."""
-        with self._lock:
+        with self._lock.write():
             data = self._load_data()
-            for cupboard in data.get('cupboards', []):
-                if cupboard['id'] == cupboard_id:
-                    cupboard['items'] = [
-                        i for i in cupboard.get('items', []) if i['id'] != item_id
-                    ]
-                    self._save_data(data)
-                    return True
-            return False
+            cupboard = self._cupboard_by_id.get(cupboard_id)
+            if cupboard is None:
+                return False
+            item = self._item_by_id.pop((cupboard_id, item_id), None)
+            if item is not None:
+                # Pin the counter first so this id is not handed out again
+                self._next_item_seq(cupboard)
+                cupboard['items'].remove(item)
+            self._save_data(data)
+            return True
 
     # ------------------------------------------------------------------
     # ADMIN - Cupboard operations
@@ -191,26 +597,34 @@ class DataManager:
 
     def add_cupboard(self, cupboard_name):
         """Add a new cupboard."""
-        with self._lock:
+        with self._lock.write():
             data = self._load_data()
-            cupboards = data.get('cupboards', [])
-            new_id = max([c['id'] for c in cupboards], default=0) + 1
-            cupboards.append({
+            cupboards = data.setdefault('cupboards', [])
+            new_id = self._next_cupboard_id(data)
+            data['next_cupboard_id'] = new_id + 1
+            cupboard = {
                 'id': new_id,
                 'name': cupboard_name,
+                'next_item_seq': 1,
                 'items': [],
-            })
-            data['cupboards'] = cupboards
+            }
+            cupboards.append(cupboard)
+            self._cupboard_by_id[new_id] = cupboard
             self._save_data(data)
             return True
 
     def remove_cupboard(self, cupboard_id):
         """Remove a cupboard and all its items."""
-        with self._lock:
+        with self._lock.write():
             data = self._load_data()
-            data['cupboards'] = [
-                c for c in data.get('cupboards', []) if c['id'] != cupboard_id
-            ]
+            if cupboard_id in self._cupboard_by_id:
+                # Pin the counter first so this id is not handed out again
+                self._next_cupboard_id(data)
+            cupboard = self._cupboard_by_id.pop(cupboard_id, None)
+            if cupboard is not None:
+                data['cupboards'].remove(cupboard)
+                for item in cupboard.get('items', []):
+                    self._item_by_id.pop((cupboard_id, item['id']), None)
             self._save_data(data)
             return True
 
@@ -219,127 +633,24 @@ class DataManager:
     # ------------------------------------------------------------------
 
     @staticmethod
+    @functools.cache
     def _get_default_data():
-        """Return default inventory data with 9 cupboards."""
+        """
+        Return default inventory data with 9 cupboards.
+        Built once and shared - callers must serialize it, not mutate it.
+        """
         return {
             "cupboards": [
                 {
-                    "id": 1,
-                    "name": "Cupboard 1 - Measurement Equipment",
-                    "items": [
-                        {"id": "C1_001", "name": "Digital Oscilloscope 100MHz",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                        {"id": "C1_002", "name": "Digital Multimeter",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                        {"id": "C1_003", "name": "Function Generator",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                        {"id": "C1_004", "name": "Logic Analyzer",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                    ],
-                },
-                {
-                    "id": 2,
-                    "name": "Cupboard 2 - Power Supplies",
-                    "items": [
-                        {"id": "C2_001", "name": "DC Power Supply 30V/5A",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                        {"id": "C2_002", "name": "Variable Power Supply",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                        {"id": "C2_003", "name": "Battery Charger",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                    ],
-                },
-                {
-                    "id": 3,
-                    "name": "Cupboard 3 - Development Boards",
-                    "items": [
-                        {"id": "C3_001", "name": "Arduino Mega",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                        {"id": "C3_002", "name": "Raspberry Pi 4",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                        {"id": "C3_003", "name": "STM32 Nucleo Board",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                        {"id": "C3_004", "name": "ESP32 Dev Kit",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                    ],
-                },
-                {
-                    "id": 4,
-                    "name": "Cupboard 4 - Networking Equipment",
-                    "items": [
-                        {"id": "C4_001", "name": "Ethernet Switch 8-Port",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                        {"id": "C4_002", "name": "Wi-Fi Router",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                        {"id": "C4_003", "name": "Network Cable Tester",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                    ],
-                },
-                {
-                    "id": 5,
-                    "name": "Cupboard 5 - Testing Tools",
-                    "items": [
-                        {"id": "C5_001", "name": "JTAG Debugger",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                        {"id": "C5_002", "name": "USB Protocol Analyzer",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                        {"id": "C5_003", "name": "CAN Bus Analyzer",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                        {"id": "C5_004", "name": "Spectrum Analyzer",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                    ],
-                },
-                {
-                    "id": 6,
-                    "name": "Cupboard 6 - Cables & Connectors",
-                    "items": [
-                        {"id": "C6_001", "name": "USB-A to USB-B Cable Set",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                        {"id": "C6_002", "name": "HDMI Cable Set",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                        {"id": "C6_003", "name": "Jumper Wire Kit",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                        {"id": "C6_004", "name": "BNC Cable Set",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                    ],
-                },
-                {
-                    "id": 7,
-                    "name": "Cupboard 7 - Safety Equipment",
-                    "items": [
-                        {"id": "C7_001", "name": "ESD Wrist Strap",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                        {"id": "C7_002", "name": "Safety Goggles",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                        {"id": "C7_003", "name": "Anti-Static Mat",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                    ],
-                },
-                {
-                    "id": 8,
-                    "name": "Cupboard 8 - Hand Tools",
-                    "items": [
-                        {"id": "C8_001", "name": "Soldering Station",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                        {"id": "C8_002", "name": "Precision Screwdriver Set",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                        {"id": "C8_003", "name": "Wire Stripper",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                        {"id": "C8_004", "name": "Heat Gun",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                    ],
-                },
-                {
-                    "id": 9,
-                    "name": "Cupboard 9 - Miscellaneous",
+                    "id": cid,
+                    "name": cname,
                     "items": [
-                        {"id": "C9_001", "name": "Label Printer",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                        {"id": "C9_002", "name": "USB Hub 7-Port",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
-                        {"id": "C9_003", "name": "SD Card Reader",
-                         "is_locked": True, "borrowed_by": None, "borrowed_at": None},
+                        {"id": f"C{cid}_{n:03d}", "name": name,
+                         "is_locked": True, "borrowed_by": None,
+                         "borrowed_at": None}
+                        for n, name in enumerate(items, start=1)
                     ],
-                },
+                }
+                for cid, cname, items in _DEFAULT_SPEC
             ]
         }
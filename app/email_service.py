@@ -1,82 +1,54 @@
+import atexit
+import queue
 import smtplib
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
+from string import Template
 
-
-def send_notification_email(action, item_name, cupboard_name, nt_id,
-                            user_email, admin_email, manager_email,
-                            sender_email, smtp_config):
-    """
-    Send email notification when an item is locked/unlocked.
-
-    Parameters
-    ----------
-    action      : 'unlocked' (borrowed) or 'locked' (returned)
-    item_name   : Name of the hardware item
-    cupboard_name : Name of the cupboard
-    nt_id       : NT ID of the user who performed the action
-    user_email  : Email of the user
-    admin_email : Admin email
-    manager_email : Manager email
-    sender_email : Sender (From) email
-    smtp_config : dict with server, port, use_tls, username, password
-    """
-
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-    if action == 'unlocked':
-        subject = f"[Lab Inventory] Item Borrowed: {item_name}"
-        action_label = "Item Borrowed (Unlocked)"
-        action_color = "#e20015"
-        person_label = "Borrowed By (NT ID)"
-    else:
-        subject = f"[Lab Inventory] Item Returned: {item_name}"
-        action_label = "Item Returned (Locked)"
-        action_color = "#00884b"
-        person_label = "Returned By (NT ID)"
-
-    body = f"""
+# HTML body of the notification email, compiled once at import
+_EMAIL_TEMPLATE = Template("""
     <html>
     <body style="font-family: Arial, sans-serif; margin: 0; padding: 20px;">
         <div style="max-width: 600px; margin: 0 auto;">
-            <div style="background-color: {action_color}; color: white;
+            <div style="background-color: $action_color; color: white;
                         padding: 15px 20px; border-radius: 5px 5px 0 0;">
                 <h2 style="margin: 0;">Lab Inventory Management</h2>
             </div>
             <div style="border: 1px solid #ddd; border-top: none;
                         padding: 20px; border-radius: 0 0 5px 5px;">
-                <h3 style="color: {action_color}; margin-top: 0;">{action_label}</h3>
+                <h3 style="color: $action_color; margin-top: 0;">$action_label</h3>
                 <table style="border-collapse: collapse; width: 100%;">
                     <tr style="background-color: #f8f9fa;">
                         <td style="padding: 10px; border: 1px solid #ddd; width: 40%;">
                             <strong>Action</strong></td>
                         <td style="padding: 10px; border: 1px solid #ddd;">
-                            {action_label}</td>
+                            $action_label</td>
                     </tr>
                     <tr>
                         <td style="padding: 10px; border: 1px solid #ddd;">
                             <strong>Item</strong></td>
                         <td style="padding: 10px; border: 1px solid #ddd;">
-                            {item_name}</td>
+                            $item_name</td>
                     </tr>
                     <tr style="background-color: #f8f9fa;">
                         <td style="padding: 10px; border: 1px solid #ddd;">
                             <strong>Location</strong></td>
                         <td style="padding: 10px; border: 1px solid #ddd;">
-                            {cupboard_name}</td>
+                            $cupboard_name</td>
                     </tr>
                     <tr>
                         <td style="padding: 10px; border: 1px solid #ddd;">
-                            <strong>{person_label}</strong></td>
+                            <strong>$person_label</strong></td>
                         <td style="padding: 10px; border: 1px solid #ddd;">
-                            {nt_id}</td>
+                            $nt_id</td>
                     </tr>
                     <tr style="background-color: #f8f9fa;">
                         <td style="padding: 10px; border: 1px solid #ddd;">
                             <strong>Date &amp; Time</strong></td>
                         <td style="padding: 10px; border: 1px solid #ddd;">
-                            {timestamp}</td>
+                            $timestamp</td>
                     </tr>
                 </table>
                 <br>
@@ -88,23 +60,35 @@ def send_notification_email(action, item_name, cupboard_name, nt_id,
         </div>
     </body>
     </html>
+    """)
+
+
+def send_notification_email(action, item_name, cupboard_name, nt_id,
+                            user_email, admin_email, manager_email,
+                            sender_email, smtp_config):
     """
+    Send email notification when an item is locked/unlocked.
 
-    # Build email message
-    msg = MIMEMultipart('alternative')
-    msg['Subject'] = subject
-    msg['From'] = sender_email
-    recipients = [admin_email, manager_email, user_email]
-    msg['To'] = ', '.join(recipients)
-    msg.attach(MIMEText(body, 'html'))
+    Parameters
+    ----------
+    action      : 'unlocked' (borrowed) or 'locked' (returned)
+    item_name   : Name of the hardware item
+    cupboard_name : Name of the cupboard
+    nt_id       : NT ID of the user who performed the action
+    user_email  : Email of the user
+    admin_email : Admin email
+    manager_email : Manager email
+    sender_email : Sender (From) email
+    smtp_config : dict with server, port, use_tls, username, password
+    """
+    subject, recipients, msg = _build_message(
+        action, item_name, cupboard_name, nt_id,
+        user_email, admin_email, manager_email, sender_email,
+    )
 
     # Send via SMTP
     try:
-        server = smtplib.SMTP(smtp_config['server'], smtp_config['port'])
-        if smtp_config.get('use_tls'):
-            server.starttls()
-        if smtp_config.get('username') and smtp_config.get('password'):
-            server.login(smtp_config['username'], smtp_config['password'])
+        server = _smtp_connect(smtp_config)
         server.sendmail(sender_email, recipients, msg.as_string())
         server.quit()
         print(f"[EMAIL] Sent successfully: {subject}")
@@ -112,3 +96,151 @@ def send_notification_email(action, item_name, cupboard_name, nt_id,
         print(f"[EMAIL ERROR] {e}")
         print(f"[EMAIL] Would have sent: {subject} to {recipients}")
         raise
+
+
+def _build_message(action, item_name, cupboard_name, nt_id,
+                   user_email, admin_email, manager_email, sender_email):
+    """Return (subject, recipients, MIME message) for a notification."""
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    if action == 'unlocked':
+        subject = f"[Lab Inventory] Item Borrowed: {item_name}"
+        action_label = "Item Borrowed (Unlocked)"
+        action_color = "#e20015"
+        person_label = "Borrowed By (NT ID)"
+    else:
+        subject = f"[Lab Inventory] Item Returned: {item_name}"
+        action_label = "Item Returned (Locked)"
+        action_color = "#00884b"
+        person_label = "Returned By (NT ID)"
+
+    body = _EMAIL_TEMPLATE.substitute(
+        action_color=action_color,
+        action_label=action_label,
+        item_name=item_name,
+        cupboard_name=cupboard_name,
+        person_label=person_label,
+        nt_id=nt_id,
+        timestamp=timestamp,
+    )
+
+    # Build email message
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = subject
+    msg['From'] = sender_email
+    recipients = [admin_email, manager_email, user_email]
+    msg['To'] = ', '.join(recipients)
+    msg.attach(MIMEText(body, 'html'))
+    return subject, recipients, msg
+
+
+def _smtp_connect(smtp_config):
+    """Open an SMTP connection, upgrading to TLS and logging in if set."""
+    server = smtplib.SMTP(smtp_config['server'], smtp_config['port'])
+    if smtp_config.get('use_tls'):
+        server.starttls()
+    if smtp_config.get('username') and smtp_config.get('password'):
+        server.login(smtp_config['username'], smtp_config['password'])
+    return server
+
+
+class EmailWorker:
+    """
+    Delivers notification emails from a background thread so the HTTP
+    request never waits on the SMTP round-trip.
+    The thread is started on the first submit (i.e. after any worker
+    fork) and drained on interpreter exit. One SMTP connection is kept
+    open across messages and closed after IDLE_TIMEOUT seconds unused.
+    """
+
+    IDLE_TIMEOUT = 60
+    _STOP = object()
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        # Only touched from the worker thread
+        self._server = None
+        self._server_key = None
+
+    def submit(self, **kwargs):
+        """Queue an email; takes the arguments of send_notification_email."""
+        self._ensure_started()
+        self._queue.put(kwargs)
+
+    def shutdown(self, timeout=10):
+        """Send whatever is still queued, then stop the thread."""
+        with self._start_lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(self._STOP)
+            thread.join(timeout)
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='email-worker', daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.shutdown)
+
+    def _run(self):
+        while True:
+            try:
+                job = self._queue.get(timeout=self.IDLE_TIMEOUT)
+            except queue.Empty:
+                self._disconnect()
+                continue
+            if job is self._STOP:
+                self._disconnect()
+                return
+            try:
+                self._deliver(**job)
+            except Exception:
+                pass  # already logged by _deliver
+
+    def _deliver(self, smtp_config, sender_email, **fields):
+        subject, recipients, msg = _build_message(
+            sender_email=sender_email, **fields
+        )
+        try:
+            # A stale connection is caught (and replaced) by the NOOP in
+            # _connection. sendmail itself is never retried: once the
+            # message may have been accepted, resending could deliver it
+            # twice.
+            server = self._connection(smtp_config)
+            server.sendmail(sender_email, recipients, msg.as_string())
+            print(f"[EMAIL] Sent successfully: {subject}")
+        except Exception as e:
+            self._disconnect()
+            print(f"[EMAIL ERROR] {e}")
+            print(f"[EMAIL] Would have sent: {subject} to {recipients}")
+            raise
+
+    def _connection(self, smtp_config):
+        """Return the open SMTP connection, reconnecting if it went stale."""
+        key = tuple(sorted(smtp_config.items()))
+        if self._server is not None and self._server_key == key:
+            try:
+                self._server.noop()
+                return self._server
+            except (smtplib.SMTPException, OSError):
+                pass
+        self._disconnect()
+        self._server = _smtp_connect(smtp_config)
+        self._server_key = key
+        return self._server
+
+    def _disconnect(self):
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            self._server.close()
+        self._server = None
+        self._server_key = None
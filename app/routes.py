@@ -1,10 +1,12 @@
 from flask import (
     Blueprint, render_template, request, redirect,
-    url_for, session, jsonify, flash, current_app,
+    url_for, session, jsonify, flash, current_app, make_response,
 )
+from config import Config
 from functools import wraps
-from app.data_manager import DataManager
-from app.email_service import send_notification_email
+import hashlib
+import hmac
+import time
 
 main_bp = Blueprint('main', __name__)
 
@@ -108,8 +110,35 @@ GROUPS = {
 # ------------------------------------------------------------------
 
 def _dm():
-    """Get a DataManager instance for the current app."""
-    return DataManager(current_app.config['DATA_FILE'])
+    """Get the DataManager instance shared by the current app."""
+    return current_app.extensions['dm']
+
+
+def _not_modified(etag):
+    """Return a 304 response if the client already holds this ETag."""
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+        response.set_etag(etag)
+        response.cache_control.no_cache = True
+        return response
+    return None
+
+
+def _templates_etag():
+    """
+    Hash of the dashboard template sources, so a deploy that changes
+    the page invalidates cached copies. Computed once per app (every
+    request in debug mode, where templates may be edited live).
+    """
+    etag = current_app.extensions.get('templates_etag')
+    if etag is None or current_app.debug:
+        env = current_app.jinja_env
+        h = hashlib.blake2b(digest_size=8)
+        for name in ('base.html', 'dashboard.html'):
+            source, _, _ = env.loader.get_source(env, name)
+            h.update(source.encode('utf-8'))
+        etag = current_app.extensions['templates_etag'] = h.hexdigest()
+    return etag
 
 
 def login_required(f):
@@ -164,8 +193,8 @@ def login():
             return render_template('login.html')
 
         if is_admin:
-            admin_pw = current_app.config['ADMIN_PASSWORD']
-            if password == admin_pw:
+            if hmac.compare_digest(password.encode('utf-8'),
+                                   Config.admin_password().encode('utf-8')):
                 session.permanent = True
                 session['nt_id'] = nt_id
                 session['role'] = 'admin'
@@ -204,14 +233,49 @@ def dashboard():
         return redirect(url_for('main.select_department'))
     if session.get('country') != 'DE' and not session.get('group'):
         return redirect(url_for('main.select_group'))
-    cupboards = _dm().get_all_cupboards()
-    return render_template(
+    dm = _dm()
+    state_etag, _ = dm.get_all_cupboards_json()
+    # The page also shows who is logged in and their selection
+    etag = hashlib.blake2b('|'.join((
+        state_etag,
+        _templates_etag(),
+        session['nt_id'],
+        session.get('role', ''),
+        session['country'],
+        session.get('department') or '',
+        session.get('group') or '',
+    )).encode('utf-8'), digest_size=8).hexdigest()
+    if '_flashes' not in session:
+        not_modified = _not_modified(etag)
+        if not_modified is not None:
+            return not_modified
+    response = make_response(render_template(
         'dashboard.html',
-        cupboards=cupboards,
+        cupboards=dm.get_all_cupboards(),
         country=session['country'],
         department=session.get('department'),
         group=session.get('group'),
+        state_etag=state_etag,
+    ))
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response
+
+
+@main_bp.route('/api/state')
+@login_required
+def state():
+    """Current cupboards as JSON; answers 304 while unchanged."""
+    etag, payload = _dm().get_all_cupboards_json()
+    not_modified = _not_modified(etag)
+    if not_modified is not None:
+        return not_modified
+    response = current_app.response_class(
+        payload, mimetype='application/json'
     )
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response
 
 
 # ------------------------------------------------------------------
@@ -290,17 +354,26 @@ def select_group():
 @main_bp.route('/api/toggle-lock', methods=['POST'])
 @login_required
 def toggle_lock():
-    data = request.get_json()
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        data = {}
     cupboard_id = data.get('cupboard_id')
     item_id = data.get('item_id')
     nt_id = session.get('nt_id')
 
-    if not cupboard_id or not item_id:
+    if (isinstance(cupboard_id, str) and cupboard_id.isascii()
+            and cupboard_id.isdigit()):
+        cupboard_id = int(cupboard_id)
+    # type() rather than isinstance(): bool is an int subclass
+    if (type(cupboard_id) is not int or not cupboard_id
+            or not isinstance(item_id, str) or not item_id):
         return jsonify({'success': False,
-                        'message': 'Missing required fields'}), 400
+                        'message': 'Missing or invalid fields'}), 400
 
     is_admin = session.get('role') == 'admin'
-    result = _dm().toggle_lock(int(cupboard_id), item_id, nt_id, is_admin)
+    timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
+    result = _dm().toggle_lock(cupboard_id, item_id, nt_id, is_admin,
+                               timestamp=timestamp)
 
     if result is None:
         return jsonify({'success': False, 'message': 'Item not found'}), 404
@@ -315,15 +388,18 @@ def toggle_lock():
         }), 403
 
     # --- Log to audit history ---
-    _dm().log_action(action, item_name, cupboard_name, nt_id)
+    _dm().log_action(action, item_name, cupboard_name, nt_id,
+                     timestamp=timestamp)
 
     # --- Send email notification ---
     # NOTE: Email functionality is disabled until SMTP details are provided.
     # Uncomment the block below once SMTP configuration is ready in config.py.
     email_sent = False
+    # The email is queued on a background worker; email_sent means
+    # "queued", delivery errors are logged by the worker.
     # try:
     #     user_email = f"{nt_id}{current_app.config['EMAIL_DOMAIN']}"
-    #     send_notification_email(
+    #     current_app.extensions['email_worker'].submit(
     #         action=action,
     #         item_name=item_name,
     #         cupboard_name=cupboard_name,
@@ -393,9 +469,12 @@ def admin():
 @main_bp.route('/admin/add-item', methods=['POST'])
 @admin_required
 def add_item():
-    cupboard_id = int(request.form.get('cupboard_id'))
+    cupboard_id = request.form.get('cupboard_id', type=int)
     item_name = request.form.get('item_name', '').strip()
 
+    if cupboard_id is None:
+        flash('Invalid cupboard.', 'danger')
+        return redirect(url_for('main.admin'))
     if not item_name:
         flash('Item name is required.', 'danger')
         return redirect(url_for('main.admin'))
@@ -410,9 +489,13 @@ def add_item():
 @main_bp.route('/admin/remove-item', methods=['POST'])
 @admin_required
 def remove_item():
-    cupboard_id = int(request.form.get('cupboard_id'))
+    cupboard_id = request.form.get('cupboard_id', type=int)
     item_id = request.form.get('item_id')
 
+    if cupboard_id is None or not item_id:
+        flash('Invalid cupboard or item.', 'danger')
+        return redirect(url_for('main.admin'))
+
     if _dm().remove_item(cupboard_id, item_id):
         flash('Item removed successfully.', 'success')
     else:
@@ -439,7 +522,11 @@ def add_cupboard():
 @main_bp.route('/admin/remove-cupboard', methods=['POST'])
 @admin_required
 def remove_cupboard():
-    cupboard_id = int(request.form.get('cupboard_id'))
+    cupboard_id = request.form.get('cupboard_id', type=int)
+
+    if cupboard_id is None:
+        flash('Invalid cupboard.', 'danger')
+        return redirect(url_for('main.admin'))
 
     if _dm().remove_cupboard(cupboard_id):
         flash('Cupboard removed successfully.', 'success')
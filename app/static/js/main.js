@@ -1,6 +1,7 @@
 /* ===========================================================
    Lab Inventory Management Tool – Main JavaScript
    Handles Lock/Unlock toggle via AJAX
+   and refreshes the dashboard when the inventory changes
    =========================================================== */
 
 /**
@@ -51,7 +52,7 @@ async function toggleLock(button) {
             }
 
             // Reload after a short delay so the user sees the toast
-            setTimeout(() => location.reload(), 1200);
+            setTimeout(reloadKeepingExpanded, 1200);
         } else {
             showToast('Error', data.message, 'danger');
             button.disabled = false;
@@ -80,3 +81,82 @@ function showToast(title, message, type) {
     const toast = new bootstrap.Toast(toastEl, { delay: 5000 });
     toast.show();
 }
+
+// sessionStorage key for the cupboards that were open before a reload
+const EXPANDED_KEY = 'expandedCupboards';
+
+/**
+ * Reload the page, re-opening the cupboards that are expanded now.
+ */
+function reloadKeepingExpanded() {
+    const ids = Array.from(
+        document.querySelectorAll('#cupboardGrid .collapse.show'),
+        (panel) => panel.id,
+    );
+    sessionStorage.setItem(EXPANDED_KEY, JSON.stringify(ids));
+    location.reload();
+}
+
+/**
+ * Re-open the cupboards saved by reloadKeepingExpanded().
+ */
+function restoreExpanded() {
+    const saved = sessionStorage.getItem(EXPANDED_KEY);
+    if (!saved) return;
+    sessionStorage.removeItem(EXPANDED_KEY);
+
+    for (const id of JSON.parse(saved)) {
+        const panel = document.getElementById(id);
+        if (!panel) continue;
+        panel.classList.add('show');
+        const header = document.querySelector(`[data-bs-target="#${id}"]`);
+        if (header) {
+            header.classList.remove('collapsed');
+            header.setAttribute('aria-expanded', 'true');
+        }
+    }
+}
+
+/**
+ * Poll /api/state with the inventory ETag the dashboard was rendered
+ * with. The server answers 304 while nothing changed; on a new ETag the
+ * page is reloaded so it shows the other users' borrows/returns.
+ * Polling does not extend the login session; once it has expired the
+ * request is redirected and the page reloads to the login screen.
+ */
+function watchInventoryState(intervalMs) {
+    const grid = document.getElementById('cupboardGrid');
+    if (!grid || !grid.dataset.stateEtag) return;
+
+    let etag = `"${grid.dataset.stateEtag}"`;
+
+    setInterval(async () => {
+        // Skip while hidden or while a lock/unlock is in flight
+        if (document.hidden || document.querySelector('.lock-btn:disabled')) {
+            return;
+        }
+        try {
+            const response = await fetch('/api/state', {
+                headers: { 'If-None-Match': etag },
+                cache: 'no-store',
+            });
+            if (response.redirected) {
+                // Session expired - show the login page
+                location.reload();
+            } else if (response.status === 200) {
+                const newEtag = response.headers.get('ETag');
+                if (newEtag && newEtag !== etag) {
+                    etag = newEtag;
+                    reloadKeepingExpanded();
+                }
+            }
+        } catch (err) {
+            // Network hiccup - try again on the next tick
+        }
+    }, intervalMs || 30000);
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    restoreExpanded();
+    watchInventoryState();
+});
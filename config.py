@@ -1,40 +1,245 @@
+import functools
 import os
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, ClassVar, Dict, Optional, Tuple
 
+# Single bound lookup for every environment variable read below
+_env = os.environ.get
+
+
+def _envbool(key, default=False):
+    """Read a boolean: 1/true/yes/on (any case) is True."""
+    value = _env(key)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _envint(key, default):
+    """Read an integer, falling back to default when unset."""
+    value = _env(key)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(
+            f"{key} must be an integer, got {value!r}"
+        ) from None
 
-class Config:
-    """Application Configuration for Lab Inventory Management Tool"""
 
-    SECRET_KEY = os.environ.get('SECRET_KEY', 'lab-inventory-secret-key-2026')
+@functools.cache
+def _base_dir():
+    """Project root (directory containing this file), resolved once."""
+    return Path(__file__).resolve().parent
 
+
+# Every setting: name -> (environment variable, reader). The reader is
+# called with the variable name and returns the parsed value; DATA_FILE
+# is not read from the environment. Config.instance() calls each reader
+# once and caches the result.
+environment_variables: Dict[
+    str, Tuple[Optional[str], Callable[[Optional[str]], Any]]
+] = {
     # ============================================================
     # SMTP Configuration - UPDATE WITH YOUR BOSCH SMTP DETAILS
     # ============================================================
-    SMTP_SERVER = os.environ.get('SMTP_SERVER', 'rb-smtp.2mdc.net')
-    SMTP_PORT = int(os.environ.get('SMTP_PORT', 25))
-    SMTP_USE_TLS = os.environ.get('SMTP_USE_TLS', 'False').lower() == 'true'
-    SMTP_USERNAME = os.environ.get('SMTP_USERNAME', '')
-    SMTP_PASSWORD = os.environ.get('SMTP_PASSWORD', '')
+    'SMTP_SERVER': ('SMTP_SERVER', lambda k: _env(k, 'rb-smtp.2mdc.net')),
+    'SMTP_PORT': ('SMTP_PORT', lambda k: _envint(k, 25)),
+    'SMTP_USE_TLS': ('SMTP_USE_TLS', _envbool),
+    'SMTP_USERNAME': ('SMTP_USERNAME', lambda k: _env(k, '')),
+    'SMTP_PASSWORD': ('SMTP_PASSWORD', lambda k: _env(k, '')),
 
     # ============================================================
     # Email Recipients - UPDATE WITH ACTUAL BOSCH EMAIL IDs
     # ============================================================
-    ADMIN_EMAIL = os.environ.get('ADMIN_EMAIL', 'mpi2cob@bosch.com')
-    MANAGER_EMAIL = os.environ.get('MANAGER_EMAIL', 'mpi2cob@bosch.com')
-    SENDER_EMAIL = os.environ.get('SENDER_EMAIL', 'lab-inventory-noreply@bosch.com')
-    EMAIL_DOMAIN = os.environ.get('EMAIL_DOMAIN', '@bosch.com')
+    'ADMIN_EMAIL': ('ADMIN_EMAIL', lambda k: _env(k, 'mpi2cob@bosch.com')),
+    'MANAGER_EMAIL': ('MANAGER_EMAIL',
+                      lambda k: _env(k, 'mpi2cob@bosch.com')),
+    'SENDER_EMAIL': ('SENDER_EMAIL',
+                     lambda k: _env(k, 'lab-inventory-noreply@bosch.com')),
+    'EMAIL_DOMAIN': ('EMAIL_DOMAIN', lambda k: _env(k, '@bosch.com')),
 
     # ============================================================
     # Admin Credentials - UPDATE WITH ACTUAL ADMIN NT ID
+    # (ADMIN_PASSWORD is a secret: see Config.admin_password())
     # ============================================================
-    ADMIN_NT_ID = os.environ.get('ADMIN_NT_ID', 'ADMIN')
-    ADMIN_PASSWORD = os.environ.get('ADMIN_PASSWORD', 'Admin@123')
+    'ADMIN_NT_ID': ('ADMIN_NT_ID', lambda k: _env(k, 'ADMIN')),
 
     # Data file path (JSON-based, no database)
-    DATA_FILE = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)),
-        'app', 'data', 'inventory.json'
-    )
+    'DATA_FILE': (None,
+                  lambda k: _base_dir() / 'app' / 'data' / 'inventory.json'),
 
     # Application Host & Port
-    HOST = os.environ.get('HOST', '0.0.0.0')
-    PORT = int(os.environ.get('PORT', 5000))
+    'HOST': ('HOST', lambda k: _env(k, '0.0.0.0')),
+    'PORT': ('PORT', lambda k: _envint(k, 5000)),
+    # Request threads per process for the production server
+    'WEB_THREADS': ('WEB_THREADS', lambda k: _envint(k, 8)),
+
+    # Debugger + auto-reloader; development only (FLASK_DEBUG=1)
+    'DEBUG': ('FLASK_DEBUG', _envbool),
+}
+
+# Environment variables the settings above depend on, derived from the
+# table. Config.instance() is cached per combination of their values, so
+# changing one (e.g. a test patching os.environ) yields a fresh Config
+# without cache busting.
+_WATCHED_ENV = tuple(
+    var for var, _ in environment_variables.values() if var is not None
+)
+
+
+def _secret(name, dev_default):
+    """
+    Read a secret from the environment at call time. The built-in
+    default is only allowed in debug mode; otherwise it must be set.
+    """
+    value = _env(name)
+    if value:
+        return value
+    if _envbool('FLASK_DEBUG'):
+        return dev_default
+    raise RuntimeError(
+        f"{name} must be set in the environment (or run with FLASK_DEBUG=1)"
+    )
+
+
+def _setting(name):
+    """Dataclass field whose default is read from the environment."""
+    var, read = environment_variables[name]
+    return field(default_factory=lambda: read(var))
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """
+    Application Configuration for Lab Inventory Management Tool.
+    Use Config.instance(): the environment is read once per distinct
+    set of values of the watched variables.
+    """
+
+    SMTP_SERVER: str = _setting('SMTP_SERVER')
+    SMTP_PORT: int = _setting('SMTP_PORT')
+    SMTP_USE_TLS: bool = _setting('SMTP_USE_TLS')
+    SMTP_USERNAME: str = _setting('SMTP_USERNAME')
+    SMTP_PASSWORD: str = _setting('SMTP_PASSWORD')
+
+    ADMIN_EMAIL: str = _setting('ADMIN_EMAIL')
+    MANAGER_EMAIL: str = _setting('MANAGER_EMAIL')
+    SENDER_EMAIL: str = _setting('SENDER_EMAIL')
+    EMAIL_DOMAIN: str = _setting('EMAIL_DOMAIN')
+
+    ADMIN_NT_ID: str = _setting('ADMIN_NT_ID')
+
+    DATA_FILE: Path = _setting('DATA_FILE')
+
+    HOST: str = _setting('HOST')
+    PORT: int = _setting('PORT')
+    WEB_THREADS: int = _setting('WEB_THREADS')
+
+    DEBUG: bool = _setting('DEBUG')
+
+    # Case-folded copies for case-insensitive comparisons, e.g.
+    # nt_id.casefold() == cfg.ADMIN_NT_ID_CF or
+    # email.casefold().endswith(cfg.EMAIL_DOMAIN_CF)
+    ADMIN_NT_ID_CF: str = field(init=False, repr=False, compare=False)
+    EMAIL_DOMAIN_CF: str = field(init=False, repr=False, compare=False)
+
+    # (config, (PORT, SMTP_PORT, SENDER_EMAIL)) of the last validate() pass
+    _validated: ClassVar[Optional[Tuple['Config', Tuple]]] = None
+
+    def __post_init__(self):
+        object.__setattr__(self, 'ADMIN_NT_ID_CF', self.ADMIN_NT_ID.casefold())
+        object.__setattr__(
+            self, 'EMAIL_DOMAIN_CF', self.EMAIL_DOMAIN.casefold()
+        )
+
+    @classmethod
+    def instance(cls):
+        """Return the Config for the current environment."""
+        return cls._for_env(tuple(_env(k) for k in _WATCHED_ENV))
+
+    @classmethod
+    @functools.lru_cache(maxsize=8)
+    def _for_env(cls, env_values):
+        return cls()
+
+    # Secrets are not fields, so they stay out of the cached instance and
+    # its repr. Flask keeps SECRET_KEY in app.config to sign sessions;
+    # ADMIN_PASSWORD is read only when an admin logs in.
+
+    @staticmethod
+    def secret_key():
+        """Flask session signing key."""
+        return _secret('SECRET_KEY', 'lab-inventory-secret-key-2026')
+
+    @staticmethod
+    def admin_password():
+        """Password for the admin login."""
+        return _secret('ADMIN_PASSWORD', 'Admin@123')
+
+    @classmethod
+    def validate(cls):
+        """
+        Check the settings once at startup; raises ValueError listing
+        every problem. Later calls return the cached result.
+        """
+        try:
+            cfg = cls.instance()
+        except ValueError as e:
+            raise ValueError(f'Invalid configuration: {e}') from None
+        if cls._validated is not None and cls._validated[0] is cfg:
+            return cls._validated[1]
+        errors = []
+        for secret in (cls.secret_key, cls.admin_password):
+            try:
+                secret()
+            except RuntimeError as e:
+                errors.append(str(e))
+        if not 1 <= cfg.PORT <= 65535:
+            errors.append(f"PORT must be 1-65535, got {cfg.PORT}")
+        if not 1 <= cfg.SMTP_PORT <= 65535:
+            errors.append(f"SMTP_PORT must be 1-65535, got {cfg.SMTP_PORT}")
+        if cfg.WEB_THREADS < 1:
+            errors.append(f"WEB_THREADS must be >= 1, got {cfg.WEB_THREADS}")
+        if not cfg.SENDER_EMAIL:
+            errors.append("SENDER_EMAIL must not be empty")
+        elif not cfg.SENDER_EMAIL.casefold().endswith(cfg.EMAIL_DOMAIN_CF):
+            errors.append(
+                f"SENDER_EMAIL {cfg.SENDER_EMAIL!r} is not in "
+                f"EMAIL_DOMAIN {cfg.EMAIL_DOMAIN!r}"
+            )
+        if errors:
+            raise ValueError('Invalid configuration: ' + '; '.join(errors))
+        result = (cfg.PORT, cfg.SMTP_PORT, cfg.SENDER_EMAIL)
+        cls._validated = (cfg, result)
+        return result
+
+
+def settings(cfg=None):
+    """Read-only {name: value} mapping of cfg (default Config.instance())."""
+    return _settings_of(Config.instance() if cfg is None else cfg)
+
+
+@functools.lru_cache(maxsize=8)
+def _settings_of(cfg):
+    return MappingProxyType({f.name: getattr(cfg, f.name)
+                             for f in fields(cfg)})
+
+
+def __getattr__(name):
+    """Expose settings as module attributes, e.g. ``config.PORT``."""
+    # Import machinery probes dunders such as __path__; answering those
+    # must not build a Config (and parse the environment) at import time
+    if name.startswith('__'):
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        )
+    try:
+        return settings()[name]
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        ) from None
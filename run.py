@@ -1,12 +1,38 @@
-from app import create_app
+import functools
+import sys
+
 from config import Config
 
-app = create_app()
+_BAR = '=' * 55
+
+
+@functools.cache
+def get_app():
+    """
+    Validate the configuration and build the Flask app on first call.
+    WSGI servers use this as a factory, e.g. gunicorn 'run:get_app()'.
+    """
+    from app import create_app
+    Config.validate()
+    return create_app(Config.instance())
+
 
 if __name__ == '__main__':
-    print(f"\n{'=' * 55}")
-    print(f"  Lab Inventory Management Tool")
-    print(f"  Running on http://localhost:{Config.PORT}")
-    print(f"  Admin NT ID: {Config.ADMIN_NT_ID}")
-    print(f"{'=' * 55}\n")
-    app.run(host=Config.HOST, port=Config.PORT, debug=True)
+    app = get_app()
+    cfg = Config.instance()
+    sys.stdout.write(
+        f"\n{_BAR}\n"
+        f"  Lab Inventory Management Tool\n"
+        f"  Running on http://localhost:{cfg.PORT}\n"
+        f"  Admin NT ID: {cfg.ADMIN_NT_ID}\n"
+        f"{_BAR}\n\n"
+    )
+    sys.stdout.flush()
+    if cfg.DEBUG:
+        # Werkzeug dev server with debugger and auto-reloader
+        app.run(host=cfg.HOST, port=cfg.PORT, debug=True, use_reloader=True)
+    else:
+        # Multi-threaded production server (works on Windows too); the
+        # Docker image runs gunicorn instead, see Dockerfile
+        from waitress import serve
+        serve(app, host=cfg.HOST, port=cfg.PORT, threads=cfg.WEB_THREADS)